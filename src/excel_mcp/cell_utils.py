@@ -1,37 +1,56 @@
-import re
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
-from openpyxl.utils import column_index_from_string
-
 if TYPE_CHECKING:
     from openpyxl.worksheet.worksheet import Worksheet
 
+# Excel's last column is XFD (16384); openpyxl accepts letters up to ZZZ
+# (18278). References beyond that must be rejected here, before a bogus
+# column index reaches the worksheet and corrupts a save.
+_MAX_COLUMN = 18278
+
+@lru_cache(maxsize=4096)
+def _parse_single(ref: str) -> tuple[int, int, int]:
+    """Parse a single cell reference like 'A1' into (row, column, end_index).
+
+    Hand-rolled scan instead of a regex: this runs on every range operation
+    and the regex state machine plus column_index_from_string dominate the
+    cost. Case folding is handled per character, so no intermediate
+    .upper() string is allocated. end_index is the position just past the
+    row digits, letting callers decide whether trailing characters matter.
+
+    Results are memoized: the same handful of references recur across rows
+    in batch formatting, so a cache hit replaces the scan with a dict
+    lookup. Use _parse_single.cache_clear() to reset between tests.
+    """
+    col = 0
+    n = len(ref)
+    i = 0
+    while i < n:
+        c = ref[i]
+        if 'A' <= c <= 'Z':
+            col = col * 26 + (ord(c) - 64)
+        elif 'a' <= c <= 'z':
+            col = col * 26 + (ord(c) - 96)
+        else:
+            break
+        i += 1
+    if col == 0 or col > _MAX_COLUMN or i >= n or not ('0' <= ref[i] <= '9'):
+        raise ValueError(f"Invalid cell reference: {ref}")
+    j = i + 1
+    while j < n and '0' <= ref[j] <= '9':
+        j += 1
+    return int(ref[i:j]), col, j
+
 def parse_cell_range(
     cell_ref: str,
     end_ref: str | None = None
 ) -> tuple[int, int, int | None, int | None]:
     """Parse Excel cell reference into row and column indices."""
+    start_row, start_col, _ = _parse_single(cell_ref)
+
     if end_ref:
-        start_cell = cell_ref
-        end_cell = end_ref
-    else:
-        start_cell = cell_ref
-        end_cell = None
-
-    match = re.match(r"([A-Z]+)([0-9]+)", start_cell.upper())
-    if not match:
-        raise ValueError(f"Invalid cell reference: {start_cell}")
-    col_str, row_str = match.groups()
-    start_row = int(row_str)
-    start_col = column_index_from_string(col_str)
-
-    if end_cell:
-        match = re.match(r"([A-Z]+)([0-9]+)", end_cell.upper())
-        if not match:
-            raise ValueError(f"Invalid cell reference: {end_cell}")
-        col_str, row_str = match.groups()
-        end_row = int(row_str)
-        end_col = column_index_from_string(col_str)
+        end_row, end_col, _ = _parse_single(end_ref)
     else:
         end_row = None
         end_col = None
@@ -48,66 +67,86 @@ def get_actual_data_range(
     max_empty_rows: int = 10
 ) -> tuple[int, int]:
     """Find the actual data range within a specified range.
-    
-    Scans the worksheet to find the last row with data, stopping early
-    if it encounters consecutive empty rows beyond the data.
-    
+
+    On a normal worksheet this sweeps the sparse cell dict once, so empty
+    regions of the requested range cost nothing (the exact data extent is
+    found even past large gaps). On sheets without that dict it falls
+    back to a top-down scan that stops after max_empty_rows consecutive
+    empty rows beyond the data.
+
     Args:
         sheet: The worksheet to scan
         start_row: Starting row index
         start_col: Starting column index
         end_row: Ending row index
         end_col: Ending column index
-        max_empty_rows: Stop scanning after this many consecutive empty rows
-        
+        max_empty_rows: Early-exit threshold for the fallback scan
+
     Returns:
         Tuple of (max_data_row, max_data_col) - the actual extent of data
-        
+
     Example:
         If data exists in rows 1-5 but range is A1:Z10000,
-        returns (5, 26) to avoid scanning 9995 empty rows
+        returns (5, 26) without ever touching the 9995 empty rows
     """
     max_data_row = start_row
     max_data_col = start_col
+
+    cells = getattr(sheet, "_cells", None)
+    if cells is not None:
+        # One pass over the populated cells only; iterating the grid via
+        # iter_rows would materialize a Cell object for every empty
+        # coordinate in the range
+        for (row, col), cell in cells.items():
+            if (start_row <= row <= end_row and start_col <= col <= end_col
+                    and cell.value not in (None, '')):
+                if row > max_data_row:
+                    max_data_row = row
+                if col > max_data_col:
+                    max_data_col = col
+        return max_data_row, max_data_col
+
+    # Fallback (e.g. read-only sheets): top-down bulk scan, stopping after
+    # max_empty_rows consecutive empty rows beyond the data
     empty_row_count = 0
-    
-    for row in range(start_row, end_row + 1):
-        has_content = False
-        row_max_col = start_col
-        
-        for col in range(start_col, end_col + 1):
-            cell_value = sheet.cell(row=row, column=col).value
-            if cell_value is not None and cell_value != '':
-                has_content = True
-                max_data_row = row
-                row_max_col = col
-                max_data_col = max(max_data_col, col)
-        
-        if has_content:
+    row_values = sheet.iter_rows(
+        min_row=start_row, max_row=end_row,
+        min_col=start_col, max_col=end_col,
+        values_only=True
+    )
+    for row, values in enumerate(row_values, start=start_row):
+        nonempty = [offset for offset, v in enumerate(values) if v not in (None, '')]
+
+        if nonempty:
+            max_data_row = row
+            max_data_col = max(max_data_col, start_col + nonempty[-1])
             empty_row_count = 0
         else:
             empty_row_count += 1
             # Stop scanning after max_empty_rows consecutive empty rows
             if empty_row_count >= max_empty_rows and row > max_data_row:
                 break
-    
+
     return max_data_row, max_data_col
 
 def validate_cell_reference(cell_ref: str) -> bool:
-    """Validate Excel cell reference format (e.g., 'A1', 'BC123')"""
-    if not cell_ref:
-        return False
-
-    # Split into column and row parts
-    col = row = ""
-    for c in cell_ref:
-        if c.isalpha():
-            if row:  # Letters after numbers not allowed
-                return False
-            col += c
-        elif c.isdigit():
-            row += c
-        else:
-            return False
+    """Validate Excel cell reference format (e.g., 'A1', 'BC123')
 
-    return bool(col and row) 
\ No newline at end of file
+    Same scan as _parse_single but tracks indices only: no accumulator
+    strings, no int conversion and no exception on the failure path, so
+    arbitrary invalid input stays cheap and out of the parse cache.
+    """
+    n = len(cell_ref)
+    i = 0
+    while i < n:
+        c = cell_ref[i]
+        if not ('A' <= c <= 'Z' or 'a' <= c <= 'z'):
+            break
+        i += 1
+    j = i
+    while j < n and '0' <= cell_ref[j] <= '9':
+        j += 1
+    # Valid iff letters then digits consume the whole string; more than
+    # three letters always exceeds the ZZZ column cap _parse_single
+    # enforces, so reject it here too
+    return 0 < i <= 3 and i < j == n 
\ No newline at end of file
@@ -1,28 +1,203 @@
+import inspect
 import logging
 import re
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from openpyxl.styles import (
     PatternFill, Border, Side, Alignment, Protection, Font,
     Color
 )
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
 from openpyxl.formatting.rule import (
     ColorScaleRule, DataBarRule, IconSetRule,
     FormulaRule, CellIsRule
 )
 from openpyxl.utils import get_column_letter
 
-from .workbook import get_or_create_workbook
-from .cell_utils import parse_cell_range, validate_cell_reference, get_actual_data_range
+from .workbook import get_or_create_workbook, _evict_cached_workbook
+from .cell_utils import parse_cell_range, validate_cell_reference
 from .exceptions import ValidationError, FormattingError
 
 logger = logging.getLogger(__name__)
 
+# Number of non-empty values to examine before committing to a column
+# classification. A column whose first 50 values agree on exactly one type
+# is overwhelmingly likely to be homogeneous; stopping there turns the
+# type scan from O(rows) into O(1) per column on large sheets.
+_TYPE_SAMPLE_SIZE = 50
 
+# Strict decimal-number shape. Testing with this before float() avoids
+# raising and unwinding a ValueError per cell on text-heavy columns, where
+# nearly every value would fail the conversion.
+_NUMERIC_RE = re.compile(r'\s*[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*\Z')
+
+# Supported date formats, most common first
+_DATE_FORMATS = [
+    # ISO formats with milliseconds
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    # ISO formats
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%Y/%m/%d %H:%M:%S',
+    # US formats
+    '%m/%d/%Y',
+    '%m-%d-%Y',
+    '%m.%d.%Y',
+    '%m/%d/%Y %H:%M:%S',
+    # EU formats
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S',
+    # Text formats
+    '%d-%b-%Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%d %b %Y',
+    '%d %B %Y',
+]
+
+
+def _separator_signature(value: str) -> str:
+    """Extract the non-alphanumeric characters of a date string, in order.
+
+    strptime only succeeds when the literal separators in the format appear
+    verbatim in the input, so two strings with different signatures can
+    never share a format. That makes the signature an exact prefilter for
+    narrowing the format list.
+    """
+    return ''.join(c for c in value if not c.isalnum())
+
+
+# Map separator signature -> the formats (in priority order) that can
+# possibly parse a string with that signature. Built once from rendered
+# samples; ambiguous shapes (e.g. US vs EU day/month order) keep several
+# candidates.
+_FORMAT_CANDIDATES: dict[str, list[str]] = {}
+for _fmt in _DATE_FORMATS:
+    _sig = _separator_signature(datetime(2024, 1, 15, 10, 30, 0, 123456).strftime(_fmt))
+    _FORMAT_CANDIDATES.setdefault(_sig, []).append(_fmt)
+del _fmt, _sig
+
+# Regex fragment and datetime() keyword for each strptime directive used in
+# _DATE_FORMATS. Matching with a compiled regex and constructing the
+# datetime from integer fields directly skips strptime's per-call format
+# interpretation and, more importantly, its exception-driven failure path.
+_DIRECTIVE_PATTERNS = {
+    '%Y': r'(\d{4})',
+    '%m': r'(\d{1,2})',
+    '%d': r'(\d{1,2})',
+    '%H': r'(\d{1,2})',
+    '%M': r'(\d{1,2})',
+    '%S': r'(\d{1,2})',
+    '%f': r'(\d{1,6})',
+    '%b': r'([A-Za-z]{3})',
+    '%B': r'([A-Za-z]{3,9})',
+}
+
+_MONTH_ABBR = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH_FULL = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5,
+    'june': 6, 'july': 7, 'august': 8, 'september': 9, 'october': 10,
+    'november': 11, 'december': 12,
+}
+
+
+def _compile_format(fmt: str) -> tuple["re.Pattern[str]", list[str]]:
+    """Compile a strptime format into an anchored regex plus field order."""
+    pattern = []
+    directives = []
+    i = 0
+    while i < len(fmt):
+        if fmt[i] == '%' and i + 1 < len(fmt):
+            directive = fmt[i:i + 2]
+            pattern.append(_DIRECTIVE_PATTERNS[directive])
+            directives.append(directive)
+            i += 2
+        else:
+            pattern.append(re.escape(fmt[i]))
+            i += 1
+    return re.compile(''.join(pattern) + r'\Z'), directives
+
+
+# fmt -> (compiled regex, directive order), for every supported format
+_FORMAT_REGEXES = {fmt: _compile_format(fmt) for fmt in _DATE_FORMATS}
+
+
+def _build_datetime(match: "re.Match[str]", directives: list[str]) -> datetime:
+    """Construct a datetime from regex groups matched by _compile_format.
+
+    Raises ValueError for out-of-range fields or unknown month names, the
+    same contract as strptime.
+    """
+    fields = {'year': 1900, 'month': 1, 'day': 1,
+              'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0}
+    for directive, group in zip(directives, match.groups()):
+        if directive == '%Y':
+            fields['year'] = int(group)
+        elif directive == '%m':
+            fields['month'] = int(group)
+        elif directive == '%d':
+            fields['day'] = int(group)
+        elif directive == '%H':
+            fields['hour'] = int(group)
+        elif directive == '%M':
+            fields['minute'] = int(group)
+        elif directive == '%S':
+            fields['second'] = int(group)
+        elif directive == '%f':
+            fields['microsecond'] = int(group.ljust(6, '0'))
+        elif directive == '%b':
+            month = _MONTH_ABBR.get(group.lower())
+            if month is None:
+                raise ValueError(f"Unknown month abbreviation: {group}")
+            fields['month'] = month
+        elif directive == '%B':
+            month = _MONTH_FULL.get(group.lower())
+            if month is None:
+                raise ValueError(f"Unknown month name: {group}")
+            fields['month'] = month
+    return datetime(**fields)
+
+
+def _try_format(value: str, fmt: str) -> datetime | None:
+    """Parse value with one format via the regex dispatcher.
+
+    Falls back to strptime for format strings outside the compiled table.
+    """
+    compiled = _FORMAT_REGEXES.get(fmt)
+    if compiled is None:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            return None
+    rx, directives = compiled
+    match = rx.match(value)
+    if match is None:
+        return None
+    try:
+        return _build_datetime(match, directives)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=8192)
 def _parse_date_string(value: str, known_format: str | None = None) -> tuple[datetime | None, str | None]:
     """Try to parse a string as a date in common formats.
-    
+
+    Results (including failed parses) are memoized: spreadsheets repeat
+    date strings heavily, and a cache hit is far cheaper than another
+    walk through the strptime format list.
+
     Supports:
     - ISO format: 2024-01-15, 2024-01-15T10:30:00
     - US format: 01/15/2024, 1/15/2024
@@ -40,53 +215,58 @@ def _parse_date_string(value: str, known_format: str | None = None) -> tuple[dat
     """
     if not isinstance(value, str):
         return None, None
-    
+
     # Clean the string
     value = value.strip()
-    
-    # If we know the format from previous cell, try it first
-    if known_format:
+
+    # Fast path for ISO dates/datetimes, by far the most common shapes:
+    # slicing plus datetime() is an order of magnitude cheaper than
+    # strptime's format interpreter. Every field must be digits-only
+    # before conversion - bare int() also accepts sign/space padding
+    # ('2024-01-+5') that strptime would reject.
+    n = len(value)
+    if (n in (10, 19) and value[4:5] == '-' and value[7:8] == '-'
+            and value[0:4].isdigit() and value[5:7].isdigit()
+            and value[8:10].isdigit()):
         try:
-            return datetime.strptime(value, known_format), known_format
+            if n == 10:
+                return (
+                    datetime(int(value[0:4]), int(value[5:7]), int(value[8:10])),
+                    '%Y-%m-%d'
+                )
+            if (value[13] == ':' and value[16] == ':' and value[10] in ('T', ' ')
+                    and value[11:13].isdigit() and value[14:16].isdigit()
+                    and value[17:19].isdigit()):
+                fmt = '%Y-%m-%dT%H:%M:%S' if value[10] == 'T' else '%Y-%m-%d %H:%M:%S'
+                return (
+                    datetime(
+                        int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19])
+                    ),
+                    fmt
+                )
         except ValueError:
-            # Format changed or invalid, fall through to try all formats
+            # Malformed despite the ISO shape; let the general path decide
             pass
-    
-    # Common date formats to try
-    date_formats = [
-        # ISO formats with milliseconds
-        '%Y-%m-%d %H:%M:%S.%f',
-        '%Y-%m-%dT%H:%M:%S.%f',
-        # ISO formats
-        '%Y-%m-%d',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y/%m/%d',
-        '%Y/%m/%d %H:%M:%S',
-        # US formats
-        '%m/%d/%Y',
-        '%m-%d-%Y',
-        '%m.%d.%Y',
-        '%m/%d/%Y %H:%M:%S',
-        # EU formats
-        '%d/%m/%Y',
-        '%d-%m-%Y',
-        '%d.%m.%Y',
-        '%d/%m/%Y %H:%M:%S',
-        # Text formats
-        '%d-%b-%Y',
-        '%b %d, %Y',
-        '%B %d, %Y',
-        '%d %b %Y',
-        '%d %B %Y',
-    ]
-    
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(value, fmt), fmt
-        except ValueError:
-            continue
-    
+
+    # If we know the format from previous cell, try it first
+    if known_format:
+        parsed = _try_format(value, known_format)
+        if parsed is not None:
+            return parsed, known_format
+        # Format changed or invalid, fall through to try all formats
+
+    # Only formats whose separator layout matches the input can possibly
+    # parse it; everything else would just burn a failed match.
+    candidates = _FORMAT_CANDIDATES.get(_separator_signature(value))
+    if not candidates:
+        return None, None
+
+    for fmt in candidates:
+        parsed = _try_format(value, fmt)
+        if parsed is not None:
+            return parsed, fmt
+
     return None, None
 
 
@@ -102,14 +282,26 @@ def _is_date_like(value: Any, known_format: str | None = None) -> tuple[bool, st
     """
     if isinstance(value, (datetime, date)):
         return True, None
-    
+
     if isinstance(value, str):
+        # Cheap shape filter first: every supported format is 8-26 chars
+        # and starts with a digit or a month name. This rejects ordinary
+        # text with two comparisons instead of a full parse attempt, and
+        # keeps non-dates out of the parse cache.
+        value = value.strip()
+        n = len(value)
+        if n < 8 or n > 26:
+            return False, None
+        first = value[0]
+        if not ('0' <= first <= '9') and value[:3].lower() not in _MONTH_ABBR:
+            return False, None
         parsed_date, fmt = _parse_date_string(value, known_format)
         return parsed_date is not None, fmt
-    
+
     return False, None
 
 
+@lru_cache(maxsize=2048)
 def _count_significant_digits(value: str) -> int:
     """Count significant digits in a numeric string.
     
@@ -128,28 +320,793 @@ def _count_significant_digits(value: str) -> int:
         '1234567890123456' -> 16
         '-123.456' -> 6
     """
-    # Remove whitespace and sign
-    cleaned = value.strip().lstrip('+-')
-    
-    # Split by decimal point
-    if '.' in cleaned:
-        integer_part, decimal_part = cleaned.split('.', 1)
-        # Remove leading zeros from integer part
-        integer_part = integer_part.lstrip('0')
-        # Keep trailing zeros in decimal part as they are significant
-        # But remove trailing zeros for counting
-        decimal_part = decimal_part.rstrip('0')
-        # Combine and count
-        significant = integer_part + decimal_part
-        if not significant:
-            return 1
-        return len(significant)
+    # Single index-tracking pass: the old strip/split/lstrip/rstrip chain
+    # allocated several transient strings per call, and this runs once per
+    # numeric cell in the detection scan.
+    n = len(value)
+    start, end = 0, n
+    # Strip whitespace and sign
+    while start < n and value[start].isspace():
+        start += 1
+    while end > start and value[end - 1].isspace():
+        end -= 1
+    while start < end and value[start] in '+-':
+        start += 1
+
+    dot = value.find('.', start, end)
+    if dot != -1:
+        # Skip leading zeros of the integer part; trailing zeros of the
+        # decimal part don't count either
+        i = start
+        while i < dot and value[i] == '0':
+            i += 1
+        j = end
+        while j > dot + 1 and value[j - 1] == '0':
+            j -= 1
+        significant = (dot - i) + (j - dot - 1)
     else:
-        # No decimal point - remove commas and leading zeros
-        cleaned = cleaned.replace(',', '').lstrip('0')
-        if not cleaned:
-            return 1
-        return len(cleaned)
+        # No decimal point - skip leading zeros (and comma separators)
+        i = start
+        while i < end and value[i] in '0,':
+            i += 1
+        significant = sum(1 for k in range(i, end) if value[k] != ',')
+
+    return significant if significant > 0 else 1
+
+_HEX_COLOR_RE = re.compile(r'[0-9A-Fa-f]{6}(?:[0-9A-Fa-f]{2})?\Z')
+
+
+@lru_cache(maxsize=256)
+def _argb(color: str) -> str:
+    """Normalize a hex color to canonical 8-character uppercase ARGB.
+
+    A bare RGB triple gets an opaque FF alpha prefixed; an 8-character
+    value is taken as already carrying its alpha. Anything else is
+    rejected here with a clear message instead of deep inside openpyxl.
+    """
+    if not _HEX_COLOR_RE.match(color):
+        raise FormattingError(
+            f"Invalid color '{color}': expected 6 or 8 hex digits"
+        )
+    color = color.upper()
+    if len(color) == 6:
+        return 'FF' + color
+    return color
+
+
+@lru_cache(maxsize=256)
+def _make_font(
+    bold: bool,
+    italic: bool,
+    underline: Optional[str],
+    size: Optional[int],
+    color: Optional[str]
+) -> Font:
+    """Build (or reuse) a Font for the given primitive attributes.
+
+    Batch exports call format_range repeatedly with the same parameters;
+    openpyxl style objects are immutable once assigned, so sharing one
+    instance across calls is safe and skips reconstruction/validation.
+    """
+    font_args = {"bold": bold, "italic": italic, "underline": underline}
+    if size is not None:
+        font_args["size"] = size
+    if color is not None:
+        font_args["color"] = Color(rgb=color)
+    return Font(**font_args)
+
+
+@lru_cache(maxsize=256)
+def _make_fill(rgb: str) -> PatternFill:
+    """Build (or reuse) a solid PatternFill for an ARGB color string."""
+    return PatternFill(
+        start_color=Color(rgb=rgb),
+        end_color=Color(rgb=rgb),
+        fill_type='solid'
+    )
+
+
+@lru_cache(maxsize=256)
+def _make_border(style: str, color: str) -> Border:
+    """Build (or reuse) a uniform Border for a style/ARGB color pair."""
+    side = Side(style=style, color=Color(rgb=color))
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+@lru_cache(maxsize=64)
+def _make_alignment(horizontal: Optional[str], wrap_text: bool) -> Alignment:
+    """Build (or reuse) a center-anchored Alignment."""
+    return Alignment(
+        horizontal=horizontal,
+        vertical='center',
+        wrap_text=wrap_text
+    )
+
+
+def _resolve_number_format_id(workbook, number_format: str) -> Optional[int]:
+    """Register a number format with the workbook once and return its id.
+
+    The cell.number_format setter re-resolves the format string against the
+    workbook table for every assignment; stamping the resolved numFmtId
+    onto each cell's StyleArray instead skips that per-cell lookup. Returns
+    None when the internal table isn't available so callers can fall back
+    to the public setter.
+    """
+    try:
+        if number_format in BUILTIN_FORMATS_REVERSE:
+            return BUILTIN_FORMATS_REVERSE[number_format]
+        return workbook._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+    except AttributeError:
+        return None
+
+
+def _stamp_number_format(cell, fmt_id: int) -> None:
+    """Assign a pre-resolved numFmtId directly to a cell's StyleArray."""
+    if cell._style is None:
+        cell._style = StyleArray()
+    cell._style.numFmtId = fmt_id
+
+
+def _iter_existing_column(sheet, col: int, start_row: int, end_row: int):
+    """Yield the cells of one column that already exist in the worksheet.
+
+    The public sheet.cell() API materializes missing cells just to stamp a
+    number format on them, which bloats sparse sheets and is the slowest
+    part of the apply loops. Reading the sparse _cells dict directly skips
+    absent cells entirely; falls back to iter_rows if the attribute ever
+    disappears from openpyxl.
+    """
+    cells = getattr(sheet, "_cells", None)
+    if cells is None:
+        for row_cells in sheet.iter_rows(
+            min_row=start_row, max_row=end_row, min_col=col, max_col=col
+        ):
+            yield row_cells[0]
+    else:
+        for row in range(start_row, end_row + 1):
+            cell = cells.get((row, col))
+            if cell is not None:
+                yield cell
+
+
+def _iter_row_values(sheet, start_row: int, end_row: int, start_col: int, end_col: int):
+    """Yield one tuple of cell values per row, read-only.
+
+    In normal (non-read-only) mode iter_rows materializes every missing
+    cell in the range just to report its value as None, permanently
+    growing the sparse cell dict. Reading _cells directly keeps the scan
+    side-effect free; absent cells read as None. Falls back to iter_rows
+    if the attribute ever disappears from openpyxl.
+    """
+    cells = getattr(sheet, "_cells", None)
+    if cells is None:
+        yield from sheet.iter_rows(
+            min_row=start_row, max_row=end_row,
+            min_col=start_col, max_col=end_col,
+            values_only=True
+        )
+        return
+    cols = range(start_col, end_col + 1)
+    for row in range(start_row, end_row + 1):
+        row_values = []
+        for col in cols:
+            cell = cells.get((row, col))
+            row_values.append(cell.value if cell is not None else None)
+        yield tuple(row_values)
+
+
+def _sparse_column_widths(
+    sheet,
+    start_row: int,
+    end_row: int,
+    start_col: int,
+    end_col: int
+) -> list[int]:
+    """Measure per-column content widths by sweeping populated cells only.
+
+    One linear pass over the sparse cell dict costs O(populated cells)
+    instead of O(range area), which is what width-only callers want on
+    sheets where the requested range is much larger than the data.
+    """
+    widths = [0] * (end_col - start_col + 1)
+    cells = getattr(sheet, "_cells", None)
+    if cells is None:
+        items = (
+            ((cell.row, cell.column), cell)
+            for row_cells in sheet.iter_rows(
+                min_row=start_row, max_row=end_row,
+                min_col=start_col, max_col=end_col
+            )
+            for cell in row_cells
+        )
+    else:
+        items = cells.items()
+    for (row, col), cell in items:
+        if not (start_row <= row <= end_row and start_col <= col <= end_col):
+            continue
+        value = cell.value
+        if not value:
+            continue
+        cell_str = value if isinstance(value, str) else str(value)
+        if '\n' in cell_str:
+            line_length = max(map(len, cell_str.split('\n')))
+        else:
+            line_length = len(cell_str)
+        if line_length > widths[col - start_col]:
+            widths[col - start_col] = line_length
+    return widths
+
+
+def _scan_range(
+    sheet,
+    start_row: int,
+    end_row: int,
+    start_col: int,
+    end_col: int,
+    max_empty_rows: int = 10,
+    need_width: bool = True
+) -> tuple[int, list[Dict[str, Any]]]:
+    """Scan a range once, collecting everything format_range needs.
+
+    Fuses the data-extent probe, per-column type detection and content
+    width measurement into a single iter_rows pass so the worksheet is
+    only walked once instead of once per concern.
+
+    Args:
+        sheet: The worksheet to scan
+        start_row: Starting row index
+        end_row: Ending row index
+        start_col: Starting column index
+        end_col: Ending column index
+        max_empty_rows: Stop scanning after this many consecutive empty rows
+        need_width: Whether to measure content widths; auto-detect-only
+            callers can skip the per-value stringification entirely
+
+    Returns:
+        Tuple of (max_data_row, columns) where columns holds one dict per
+        column in the range with keys: has_data, is_numeric, is_date,
+        is_datetime, detected_date_format, has_long_number, max_width
+    """
+    # Excel's precision limit: 15 significant digits (IEEE-754 double precision)
+    EXCEL_MAX_PRECISION_DIGITS = 15
+
+    columns = [
+        {
+            "has_data": False,
+            "is_numeric": True,
+            "is_date": True,
+            "is_datetime": False,
+            "detected_date_format": None,
+            "has_long_number": False,
+            "max_width": 0,
+            "samples": 0,
+            "parsed_dates": {},
+        }
+        for _ in range(end_col - start_col + 1)
+    ]
+    max_data_row = start_row
+    empty_row_count = 0
+
+    row_values = _iter_row_values(sheet, start_row, end_row, start_col, end_col)
+    for row, values in enumerate(row_values, start=start_row):
+        has_content = False
+
+        for idx, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            has_content = True
+            max_data_row = row
+            stats = columns[idx]
+            stats["has_data"] = True
+
+            # Content width; only pay for the line split when the value is
+            # actually multi-line (rare)
+            if need_width:
+                cell_str = value if isinstance(value, str) else str(value)
+                if '\n' in cell_str:
+                    line_length = max(map(len, cell_str.split('\n')))
+                else:
+                    line_length = len(cell_str)
+                if line_length > stats["max_width"]:
+                    stats["max_width"] = line_length
+
+            # Type detection; skip once both classifications have failed,
+            # or once a large enough sample has settled on a single type
+            if not stats["is_numeric"] and not stats["is_date"]:
+                continue
+            if (stats["samples"] >= _TYPE_SAMPLE_SIZE
+                    and stats["is_numeric"] != stats["is_date"]
+                    and not stats["has_long_number"]):
+                # Settled numeric columns still get the cheap precision
+                # check: a >15-significant-digit value appearing after the
+                # sample must demote the column to text, or the apply pass
+                # would convert it and silently lose digits
+                if stats["is_numeric"]:
+                    if isinstance(value, (int, float)):
+                        digits = _count_significant_digits(str(value))
+                    elif isinstance(value, str) and _NUMERIC_RE.match(value):
+                        digits = _count_significant_digits(value)
+                    else:
+                        digits = 0
+                    if digits > EXCEL_MAX_PRECISION_DIGITS:
+                        stats["has_long_number"] = True
+                        stats["is_numeric"] = False
+                continue
+            stats["samples"] += 1
+
+            if isinstance(value, (int, float)):
+                # Already numeric, not a date
+                stats["is_date"] = False
+                # Check if it's too long (would lose precision)
+                if _count_significant_digits(str(value)) > EXCEL_MAX_PRECISION_DIGITS:
+                    stats["has_long_number"] = True
+                    stats["is_numeric"] = False
+            elif isinstance(value, str):
+                # Only attempt the float parse while the column is still a
+                # numeric candidate; on a date/text column every cell would
+                # otherwise pay the ValueError machinery just to rediscover
+                # that. A numeric string in a date column still fails the
+                # date check below, so classification is unchanged.
+                if stats["is_numeric"]:
+                    if _NUMERIC_RE.match(value):
+                        # It's a numeric string, not a date
+                        stats["is_date"] = False
+                        # Check if it's too long for Excel's precision
+                        if _count_significant_digits(value) > EXCEL_MAX_PRECISION_DIGITS:
+                            stats["has_long_number"] = True
+                            stats["is_numeric"] = False
+                        continue
+                    stats["is_numeric"] = False
+                # Not numeric, check if it's a date. Once a format has been
+                # detected for the column, try it directly first: on
+                # homogeneous columns (the common case) this is a single
+                # regex match instead of the prefilter + dispatch walk.
+                locked_format = stats["detected_date_format"]
+                if locked_format is not None:
+                    parsed = _try_format(value.strip(), locked_format)
+                    if parsed is not None:
+                        stats["parsed_dates"][row] = parsed
+                        if ' ' in value or 'T' in value:
+                            stats["is_datetime"] = True
+                        continue
+                is_date_value, date_fmt = _is_date_like(
+                    value, locked_format
+                )
+                if not is_date_value:
+                    stats["is_date"] = False
+                else:
+                    # Cache the format for subsequent rows
+                    if date_fmt:
+                        stats["detected_date_format"] = date_fmt
+                    # Remember the parsed value so the apply pass doesn't
+                    # have to parse this cell a second time (the repeat
+                    # lookup below is a cache hit)
+                    parsed, _ = _parse_date_string(value.strip(), date_fmt)
+                    if parsed is not None:
+                        stats["parsed_dates"][row] = parsed
+                    # Check if it has time component (datetime vs date)
+                    if ' ' in value or 'T' in value:
+                        stats["is_datetime"] = True
+            elif isinstance(value, datetime):
+                stats["is_numeric"] = False
+                stats["is_datetime"] = True
+            elif isinstance(value, date):
+                stats["is_numeric"] = False
+            else:
+                stats["is_numeric"] = False
+                stats["is_date"] = False
+
+        if has_content:
+            empty_row_count = 0
+        else:
+            empty_row_count += 1
+            # Stop scanning after max_empty_rows consecutive empty rows
+            if empty_row_count >= max_empty_rows and row > max_data_row:
+                break
+
+    return max_data_row, columns
+
+
+def _format_range_on_sheet(
+    sheet,
+    start_cell: str,
+    end_cell: Optional[str] = None,
+    bold: bool = False,
+    italic: bool = False,
+    underline: bool = False,
+    font_size: Optional[int] = None,
+    font_color: Optional[str] = None,
+    bg_color: Optional[str] = None,
+    border_style: Optional[str] = None,
+    border_color: Optional[str] = None,
+    number_format: Optional[str] = None,
+    alignment: Optional[str] = None,
+    wrap_text: bool = False,
+    merge_cells: bool = False,
+    protection: Optional[Dict[str, Any]] = None,
+    conditional_format: Optional[Dict[str, Any]] = None,
+    auto_column_width: bool = False,
+    column_width: Optional[float] = None,
+    auto_detect_numeric_columns: bool = False,
+    date_format: Optional[str] = None,
+    auto_detect_date_columns: bool = False,
+    reset_font: bool = False
+) -> Dict[str, Any]:
+    """Apply one formatting spec to an already-loaded worksheet.
+
+    Core of format_range, factored out so batch callers can apply many
+    specs within a single workbook load/save. Takes the same options as
+    format_range minus the file handling; raises ValidationError or
+    FormattingError on bad input and leaves saving to the caller.
+    """
+    # Validate cell references
+    if not validate_cell_reference(start_cell):
+        raise ValidationError(f"Invalid start cell reference: {start_cell}")
+        
+    if end_cell and not validate_cell_reference(end_cell):
+        raise ValidationError(f"Invalid end cell reference: {end_cell}")
+
+    # Get cell range coordinates
+    try:
+        start_row, start_col, end_row, end_col = parse_cell_range(start_cell, end_cell)
+    except ValueError as e:
+        raise ValidationError(f"Invalid cell range: {str(e)}")
+    
+    # If no end cell specified, use start cell coordinates
+    if end_row is None:
+        end_row = start_row
+    if end_col is None:
+        end_col = start_col
+        
+    # Apply font formatting; when no font option was requested, skip the
+    # per-cell font writes entirely so existing fonts are left alone and
+    # the inner loop avoids openpyxl's style-registration cost.
+    font = None
+    if (reset_font or bold or italic or underline
+            or font_size is not None or font_color is not None):
+        try:
+            font = _make_font(
+                bold, italic, 'single' if underline else None,
+                font_size, _argb(font_color) if font_color is not None else None
+            )
+        except ValueError as e:
+            raise FormattingError(f"Invalid font color: {str(e)}")
+    
+    # Apply fill
+    fill = None
+    if bg_color is not None:
+        try:
+            fill = _make_fill(_argb(bg_color))
+        except ValueError as e:
+            raise FormattingError(f"Invalid background color: {str(e)}")
+    
+    # Apply borders
+    border = None
+    if border_style is not None:
+        try:
+            border = _make_border(border_style, _argb(border_color or "000000"))
+        except ValueError as e:
+            raise FormattingError(f"Invalid border settings: {str(e)}")
+        
+    # Apply alignment
+    align = None
+    if alignment is not None or wrap_text:
+        try:
+            align = _make_alignment(alignment, wrap_text)
+        except ValueError as e:
+            raise FormattingError(f"Invalid alignment settings: {str(e)}")
+        
+    # Apply protection
+    protect = None
+    if protection is not None:
+        try:
+            protect = Protection(**protection)
+        except ValueError as e:
+            raise FormattingError(f"Invalid protection settings: {str(e)}")
+        
+    # Apply formatting to range; iter_rows hands back Cell objects in
+    # bulk instead of a dimension-checked sheet.cell() call per cell.
+    # Each property setter walks openpyxl's style-registration path, so
+    # run the setters once per *distinct* starting style and broadcast
+    # the resolved StyleArray to every other cell that started from the
+    # same style. Cells get their own array copy (a C-level memcpy)
+    # because openpyxl setters mutate StyleArrays in place.
+    wants_style = (
+        font is not None or fill is not None or border is not None
+        or align is not None or protect is not None
+        or number_format is not None
+        or (date_format is not None and not auto_detect_date_columns)
+    )
+    if wants_style:
+        style_templates: Dict[bytes | None, StyleArray] = {}
+        for row_cells in sheet.iter_rows(
+            min_row=start_row, max_row=end_row,
+            min_col=start_col, max_col=end_col
+        ):
+            for cell in row_cells:
+                orig = cell._style
+                key = orig.tobytes() if orig is not None else None
+                template = style_templates.get(key)
+                if template is not None:
+                    cell._style = StyleArray(template)
+                else:
+                    if font is not None:
+                        cell.font = font
+                    if fill is not None:
+                        cell.fill = fill
+                    if border is not None:
+                        cell.border = border
+                    if align is not None:
+                        cell.alignment = align
+                    if protect is not None:
+                        cell.protection = protect
+                    if number_format is not None:
+                        cell.number_format = number_format
+                    if cell._style is not None:
+                        style_templates[key] = StyleArray(cell._style)
+
+                # Apply date format if specified (convert string dates to datetime)
+                if date_format is not None and not auto_detect_date_columns:
+                    if isinstance(cell.value, str):
+                        parsed_date, _ = _parse_date_string(cell.value)
+                        if parsed_date:
+                            cell.value = parsed_date
+                    cell.number_format = date_format
+                
+    # Merge cells if requested
+    if merge_cells and end_cell:
+        try:
+            range_str = f"{start_cell}:{end_cell}"
+            sheet.merge_cells(range_str)
+        except ValueError as e:
+            raise FormattingError(f"Failed to merge cells: {str(e)}")
+        
+    # Apply conditional formatting
+    if conditional_format is not None:
+        range_str = f"{start_cell}:{end_cell}" if end_cell else start_cell
+        rule_type = conditional_format.get('type')
+        if not rule_type:
+            raise FormattingError("Conditional format type not specified")
+            
+        params = conditional_format.get('params', {})
+        
+        # Handle fill parameter for cell_is rule
+        if rule_type == 'cell_is' and 'fill' in params:
+            fill_params = params['fill']
+            if isinstance(fill_params, dict):
+                try:
+                    fill_color = fill_params.get('fgColor', 'FFC7CE')  # Default to light red
+                    fill_color = _argb(fill_color)
+                    params['fill'] = PatternFill(
+                        start_color=fill_color,
+                        end_color=fill_color,
+                        fill_type='solid'
+                    )
+                except ValueError as e:
+                    raise FormattingError(f"Invalid conditional format fill color: {str(e)}")
+        
+        try:
+            if rule_type == 'color_scale':
+                rule = ColorScaleRule(**params)
+            elif rule_type == 'data_bar':
+                rule = DataBarRule(**params)
+            elif rule_type == 'icon_set':
+                rule = IconSetRule(**params)
+            elif rule_type == 'formula':
+                rule = FormulaRule(**params)
+            elif rule_type == 'cell_is':
+                rule = CellIsRule(**params)
+            else:
+                raise FormattingError(f"Invalid conditional format type: {rule_type}")
+                
+            sheet.conditional_formatting.add(range_str, rule)
+        except Exception as e:
+            raise FormattingError(f"Failed to apply conditional formatting: {str(e)}")
+    
+    # Track auto-detection results
+    auto_detection_results = {
+        "numeric_columns": [],
+        "date_columns": [],
+        "datetime_columns": [],
+        "text_columns": [],
+        "long_number_columns": []
+    }
+    
+    # Column letters for the range, computed once instead of per loop
+    # iteration in the blocks below
+    if (auto_detect_numeric_columns or auto_detect_date_columns
+            or auto_column_width or column_width is not None):
+        col_letters = {c: get_column_letter(c) for c in range(start_col, end_col + 1)}
+
+    # Scan the range once for everything the auto features need: data
+    # extent, per-column types and content widths. Width-only callers get
+    # a cheaper sweep over just the populated cells instead.
+    scan_columns = None
+    content_widths = None
+    if auto_detect_numeric_columns or auto_detect_date_columns:
+        max_data_row, scan_columns = _scan_range(
+            sheet, start_row, end_row, start_col, end_col,
+            max_empty_rows=10, need_width=auto_column_width
+        )
+        if auto_column_width:
+            content_widths = [stats["max_width"] for stats in scan_columns]
+    elif auto_column_width:
+        content_widths = _sparse_column_widths(
+            sheet, start_row, end_row, start_col, end_col
+        )
+
+    # Auto-detect and apply formats to columns
+    if auto_detect_numeric_columns or auto_detect_date_columns:
+        for col in range(start_col, end_col + 1):
+            stats = scan_columns[col - start_col]
+            is_numeric = stats["is_numeric"]
+            is_date = stats["is_date"]
+            is_datetime = stats["is_datetime"]
+            has_data = stats["has_data"]
+            detected_date_format = stats["detected_date_format"]
+            has_long_number = stats["has_long_number"]
+
+            # Apply formats based on detection and track results
+            col_letter = col_letters[col]
+            if has_data:
+                # Log if column has long numbers that are kept as text
+                if has_long_number:
+                    logger.info(
+                        f"Column {col_letter} contains numbers with >15 significant digits. "
+                        f"Keeping as text to prevent data loss (Excel's precision limit is 15 digits)."
+                    )
+                    auto_detection_results["long_number_columns"].append(col_letter)
+                
+                if auto_detect_numeric_columns and is_numeric and number_format:
+                    # Convert string numbers to actual numbers and apply
+                    # format; the format id is resolved once for the column
+                    fmt_id = _resolve_number_format_id(sheet.parent, number_format)
+                    for cell in _iter_existing_column(sheet, col, start_row, end_row):
+                        value = cell.value
+                        if (isinstance(value, str)
+                                and _NUMERIC_RE.match(value)):
+                            # Integer unless a decimal point or exponent
+                            # says otherwise; the regex already
+                            # guarantees the conversion succeeds
+                            if '.' in value or 'e' in value or 'E' in value:
+                                cell.value = float(value)
+                            else:
+                                cell.value = int(value)
+                        if fmt_id is None:
+                            cell.number_format = number_format
+                        else:
+                            _stamp_number_format(cell, fmt_id)
+                    auto_detection_results["numeric_columns"].append(col_letter)
+                
+                if auto_detect_date_columns and is_date:
+                    # Determine appropriate date format
+                    if date_format:
+                        actual_date_format = date_format
+                    elif is_datetime:
+                        # Default datetime format
+                        actual_date_format = 'yyyy-mm-dd hh:mm:ss'
+                    else:
+                        # Default date-only format
+                        actual_date_format = 'yyyy-mm-dd'
+                    
+                    # Convert date strings to Excel date objects and apply format
+                    # Use cached format for performance
+                    column_date_format = detected_date_format
+                    parsed_dates = stats["parsed_dates"]
+                    fmt_id = _resolve_number_format_id(sheet.parent, actual_date_format)
+                    for cell in _iter_existing_column(sheet, col, start_row, end_row):
+                        value = cell.value
+
+                        # Values that are already dates only need the
+                        # number format; don't re-run the parser
+                        if not isinstance(value, (datetime, date)):
+                            # Convert string dates to datetime objects,
+                            # reusing values already parsed during the scan
+                            if isinstance(value, str) and value.strip():
+                                parsed_date = parsed_dates.get(cell.row)
+                                if parsed_date is None:
+                                    parsed_date, fmt = _parse_date_string(value, column_date_format)
+                                    # Cache format for next iteration
+                                    if parsed_date and fmt and not column_date_format:
+                                        column_date_format = fmt
+                                if parsed_date:
+                                    cell.value = parsed_date
+
+                        # Apply date format
+                        if fmt_id is None:
+                            cell.number_format = actual_date_format
+                        else:
+                            _stamp_number_format(cell, fmt_id)
+                    
+                    # Track whether it's datetime or date
+                    if is_datetime:
+                        auto_detection_results["datetime_columns"].append(col_letter)
+                    else:
+                        auto_detection_results["date_columns"].append(col_letter)
+                
+                # Track text columns (columns that weren't detected as numeric or date)
+                if not is_numeric and not is_date and not has_long_number:
+                    auto_detection_results["text_columns"].append(col_letter)
+    
+    # Apply column width settings
+    if column_width is not None:
+        # Apply absolute width to all columns in range
+        for col in range(start_col, end_col + 1):
+            col_letter = col_letters[col]
+            sheet.column_dimensions[col_letter].width = column_width
+    
+    if auto_column_width:
+        # Auto-adjust width based on content, reusing the widths gathered
+        # above rather than walking the range again.
+        for col in range(start_col, end_col + 1):
+            max_length = content_widths[col - start_col]
+            col_letter = col_letters[col]
+
+            # ALWAYS check row 1 (header row) first, even if not in the formatting range
+            # This ensures column width accommodates the header
+            header_cell = sheet.cell(row=1, column=col)
+            if header_cell.value:
+                header_str = str(header_cell.value)
+                header_lines = header_str.split('\n')
+                header_length = max(len(line) for line in header_lines)
+                max_length = max(max_length, header_length)
+
+            # Approximate width calculation (character width ~1.2)
+            # Add padding for better appearance
+            if max_length > 0:
+                adjusted_width = (max_length * 1.2) + 2
+                # Cap maximum width to 100 for readability
+                adjusted_width = min(adjusted_width, 100)
+                sheet.column_dimensions[col_letter].width = adjusted_width
+        
+    
+    range_str = f"{start_cell}:{end_cell}" if end_cell else start_cell
+    result = {
+        "message": f"Applied formatting to range {range_str}",
+        "range": range_str
+    }
+    
+    # Add auto-detection results if any detection was performed
+    if auto_detect_numeric_columns or auto_detect_date_columns:
+        result["auto_detection"] = {
+            "numeric_columns": auto_detection_results["numeric_columns"],
+            "date_columns": auto_detection_results["date_columns"],
+            "datetime_columns": auto_detection_results["datetime_columns"],
+            "text_columns": auto_detection_results["text_columns"],
+            "long_number_columns": auto_detection_results["long_number_columns"]
+        }
+        
+        # Add summary message with column lists
+        summary_parts = []
+        if auto_detection_results["numeric_columns"]:
+            cols = ", ".join(auto_detection_results['numeric_columns'])
+            summary_parts.append(f"numeric: {cols}")
+        if auto_detection_results["date_columns"]:
+            cols = ", ".join(auto_detection_results['date_columns'])
+            summary_parts.append(f"date: {cols}")
+        if auto_detection_results["datetime_columns"]:
+            cols = ", ".join(auto_detection_results['datetime_columns'])
+            summary_parts.append(f"datetime: {cols}")
+        if auto_detection_results["long_number_columns"]:
+            cols = ", ".join(auto_detection_results['long_number_columns'])
+            summary_parts.append(f"long number (kept as text): {cols}")
+        if auto_detection_results["text_columns"]:
+            cols = ", ".join(auto_detection_results['text_columns'])
+            summary_parts.append(f"text: {cols}")
+        
+        if summary_parts:
+            result["auto_detection"]["summary"] = f"Detected columns - {'; '.join(summary_parts)}"
+
+    return result
+
+
+# Option names a format_ranges spec may carry: everything the per-range
+# helper accepts except the worksheet itself
+_FORMAT_SPEC_OPTIONS = frozenset(
+    name for name in inspect.signature(_format_range_on_sheet).parameters
+    if name != 'sheet'
+)
+
 
 def format_range(
     filepath: str,
@@ -174,7 +1131,8 @@ def format_range(
     column_width: Optional[float] = None,
     auto_detect_numeric_columns: bool = False,
     date_format: Optional[str] = None,
-    auto_detect_date_columns: bool = False
+    auto_detect_date_columns: bool = False,
+    reset_font: bool = False
 ) -> Dict[str, Any]:
     """Apply formatting to a range of cells.
     
@@ -214,427 +1172,126 @@ def format_range(
         auto_detect_numeric_columns: Auto-detect and apply number format to numeric columns
         date_format: Date format string (e.g., 'yyyy-mm-dd')
         auto_detect_date_columns: Auto-detect and apply date format to date columns
-        
+        reset_font: Force-write the default font even when no font option
+            is set, restoring the old clobber-everything behavior for
+            callers that rely on it
+
     Returns:
         Dictionary with operation status
+
+    Note:
+        Each call loads the workbook from disk and saves it again; that
+        serialization dominates the cost on large files. Callers styling
+        several ranges of the same sheet should use format_ranges, which
+        holds one workbook across all specs and saves once.
     """
     try:
-        # Validate cell references
+        # Validate the references before get_or_create_workbook runs: a
+        # bad request must not leave a freshly created empty workbook on
+        # disk as a side effect
         if not validate_cell_reference(start_cell):
             raise ValidationError(f"Invalid start cell reference: {start_cell}")
-            
         if end_cell and not validate_cell_reference(end_cell):
             raise ValidationError(f"Invalid end cell reference: {end_cell}")
-            
+
         wb = get_or_create_workbook(filepath)
         if sheet_name not in wb.sheetnames:
             raise ValidationError(f"Sheet '{sheet_name}' not found")
-            
-        sheet = wb[sheet_name]
-        
-        # Get cell range coordinates
-        try:
-            start_row, start_col, end_row, end_col = parse_cell_range(start_cell, end_cell)
-        except ValueError as e:
-            raise ValidationError(f"Invalid cell range: {str(e)}")
-        
-        # If no end cell specified, use start cell coordinates
-        if end_row is None:
-            end_row = start_row
-        if end_col is None:
-            end_col = start_col
-            
-        # Apply font formatting
-        font_args = {
-            "bold": bold,
-            "italic": italic,
-            "underline": 'single' if underline else None,
-        }
-        if font_size is not None:
-            font_args["size"] = font_size
-        if font_color is not None:
-            try:
-                # Ensure color has FF prefix for full opacity
-                font_color = font_color if font_color.startswith('FF') else f'FF{font_color}'
-                font_args["color"] = Color(rgb=font_color)
-            except ValueError as e:
-                raise FormattingError(f"Invalid font color: {str(e)}")
-        font = Font(**font_args)
-        
-        # Apply fill
-        fill = None
-        if bg_color is not None:
-            try:
-                # Ensure color has FF prefix for full opacity
-                bg_color = bg_color if bg_color.startswith('FF') else f'FF{bg_color}'
-                fill = PatternFill(
-                    start_color=Color(rgb=bg_color),
-                    end_color=Color(rgb=bg_color),
-                    fill_type='solid'
-                )
-            except ValueError as e:
-                raise FormattingError(f"Invalid background color: {str(e)}")
-        
-        # Apply borders
-        border = None
-        if border_style is not None:
-            try:
-                border_color = border_color if border_color else "000000"
-                border_color = border_color if border_color.startswith('FF') else f'FF{border_color}'
-                side = Side(
-                    style=border_style,
-                    color=Color(rgb=border_color)
-                )
-                border = Border(
-                    left=side,
-                    right=side,
-                    top=side,
-                    bottom=side
+
+        result = _format_range_on_sheet(
+            wb[sheet_name],
+            start_cell=start_cell,
+            end_cell=end_cell,
+            bold=bold,
+            italic=italic,
+            underline=underline,
+            font_size=font_size,
+            font_color=font_color,
+            bg_color=bg_color,
+            border_style=border_style,
+            border_color=border_color,
+            number_format=number_format,
+            alignment=alignment,
+            wrap_text=wrap_text,
+            merge_cells=merge_cells,
+            protection=protection,
+            conditional_format=conditional_format,
+            auto_column_width=auto_column_width,
+            column_width=column_width,
+            auto_detect_numeric_columns=auto_detect_numeric_columns,
+            date_format=date_format,
+            auto_detect_date_columns=auto_detect_date_columns,
+            reset_font=reset_font
+        )
+        _evict_cached_workbook(filepath)
+        wb.save(filepath)
+        return result
+
+    except (ValidationError, FormattingError) as e:
+        logger.error(str(e))
+        raise
+    except Exception as e:
+        logger.error(f"Failed to apply formatting: {e}")
+        raise FormattingError(str(e))
+
+def format_ranges(
+    filepath: str,
+    sheet_name: str,
+    specs: list[Dict[str, Any]]
+) -> list[Dict[str, Any]]:
+    """Apply several formatting specs with one workbook load and save.
+
+    Each spec is a dict of format_range keyword arguments (minus filepath
+    and sheet_name), e.g. {"start_cell": "A1", "end_cell": "C1", "bold": True}.
+    Equivalent to calling format_range once per spec, but the workbook is
+    parsed and serialized a single time, which dominates the cost of
+    repeated calls on large files.
+
+    Args:
+        filepath: Path to Excel file
+        sheet_name: Name of worksheet
+        specs: List of formatting specs applied in order
+
+    Returns:
+        List with one result dictionary per spec
+    """
+    try:
+        # Validate every spec before get_or_create_workbook runs, so a
+        # malformed batch doesn't leave a freshly created empty workbook
+        # behind. Naming bad or missing options explicitly also keeps the
+        # **spec unpacking from leaking the helper's name to MCP clients.
+        for spec in specs:
+            unknown = set(spec) - _FORMAT_SPEC_OPTIONS
+            if unknown:
+                raise ValidationError(
+                    f"Unknown format option(s): {', '.join(sorted(unknown))}"
                 )
-            except ValueError as e:
-                raise FormattingError(f"Invalid border settings: {str(e)}")
-            
-        # Apply alignment
-        align = None
-        if alignment is not None or wrap_text:
-            try:
-                align = Alignment(
-                    horizontal=alignment,
-                    vertical='center',
-                    wrap_text=wrap_text
+            if 'start_cell' not in spec:
+                raise ValidationError(
+                    f"Formatting spec is missing required 'start_cell': {spec!r}"
                 )
-            except ValueError as e:
-                raise FormattingError(f"Invalid alignment settings: {str(e)}")
-            
-        # Apply protection
-        protect = None
-        if protection is not None:
-            try:
-                protect = Protection(**protection)
-            except ValueError as e:
-                raise FormattingError(f"Invalid protection settings: {str(e)}")
-            
-        # Apply formatting to range
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                cell = sheet.cell(row=row, column=col)
-                cell.font = font
-                if fill is not None:
-                    cell.fill = fill
-                if border is not None:
-                    cell.border = border
-                if align is not None:
-                    cell.alignment = align
-                if protect is not None:
-                    cell.protection = protect
-                if number_format is not None:
-                    cell.number_format = number_format
-                
-                # Apply date format if specified (convert string dates to datetime)
-                if date_format is not None and not auto_detect_date_columns:
-                    if isinstance(cell.value, str):
-                        parsed_date, _ = _parse_date_string(cell.value)
-                        if parsed_date:
-                            cell.value = parsed_date
-                    cell.number_format = date_format
-                    
-        # Merge cells if requested
-        if merge_cells and end_cell:
-            try:
-                range_str = f"{start_cell}:{end_cell}"
-                sheet.merge_cells(range_str)
-            except ValueError as e:
-                raise FormattingError(f"Failed to merge cells: {str(e)}")
-            
-        # Apply conditional formatting
-        if conditional_format is not None:
-            range_str = f"{start_cell}:{end_cell}" if end_cell else start_cell
-            rule_type = conditional_format.get('type')
-            if not rule_type:
-                raise FormattingError("Conditional format type not specified")
-                
-            params = conditional_format.get('params', {})
-            
-            # Handle fill parameter for cell_is rule
-            if rule_type == 'cell_is' and 'fill' in params:
-                fill_params = params['fill']
-                if isinstance(fill_params, dict):
-                    try:
-                        fill_color = fill_params.get('fgColor', 'FFC7CE')  # Default to light red
-                        fill_color = fill_color if fill_color.startswith('FF') else f'FF{fill_color}'
-                        params['fill'] = PatternFill(
-                            start_color=fill_color,
-                            end_color=fill_color,
-                            fill_type='solid'
-                        )
-                    except ValueError as e:
-                        raise FormattingError(f"Invalid conditional format fill color: {str(e)}")
-            
-            try:
-                if rule_type == 'color_scale':
-                    rule = ColorScaleRule(**params)
-                elif rule_type == 'data_bar':
-                    rule = DataBarRule(**params)
-                elif rule_type == 'icon_set':
-                    rule = IconSetRule(**params)
-                elif rule_type == 'formula':
-                    rule = FormulaRule(**params)
-                elif rule_type == 'cell_is':
-                    rule = CellIsRule(**params)
-                else:
-                    raise FormattingError(f"Invalid conditional format type: {rule_type}")
-                    
-                sheet.conditional_formatting.add(range_str, rule)
-            except Exception as e:
-                raise FormattingError(f"Failed to apply conditional formatting: {str(e)}")
-        
-        # Track auto-detection results
-        auto_detection_results = {
-            "numeric_columns": [],
-            "date_columns": [],
-            "datetime_columns": [],
-            "text_columns": [],
-            "long_number_columns": []
-        }
-        
-        # Auto-detect and apply formats to columns
-        # OPTIMIZATION: Only scan rows that actually have data
-        if auto_detect_numeric_columns or auto_detect_date_columns:
-            # Find the actual data range (stops early at empty rows)
-            max_data_row, max_data_col = get_actual_data_range(
-                sheet, start_row, start_col, end_row, end_col, max_empty_rows=10
-            )
-            
-            # Analyze column data types (only scan rows with data)
-            for col in range(start_col, end_col + 1):
-                is_numeric = True
-                is_date = True
-                is_datetime = False  # Track if we have datetime vs pure date
-                has_data = False
-                detected_date_format = None  # Cache the date format for this column
-                has_long_number = False  # Track if column has numbers > 15 digits
-                
-                # Excel's precision limit: 15 significant digits (IEEE-754 double precision)
-                EXCEL_MAX_PRECISION_DIGITS = 15
-                
-                # Only scan up to max_data_row instead of entire range
-                for row in range(start_row, min(max_data_row + 1, end_row + 1)):
-                    cell = sheet.cell(row=row, column=col)
-                    value = cell.value
-                    
-                    if value is not None and value != '':
-                        has_data = True
-                        
-                        # Check if numeric (including string representations)
-                        if isinstance(value, (int, float)):
-                            # Already numeric, not a date
-                            is_date = False
-                            # Check if it's too long (would lose precision)
-                            # Convert to string to count digits
-                            str_value = str(value)
-                            if _count_significant_digits(str_value) > EXCEL_MAX_PRECISION_DIGITS:
-                                has_long_number = True
-                                is_numeric = False
-                        elif isinstance(value, str):
-                            # Try to parse as number
-                            try:
-                                float(value)
-                                # It's a numeric string, not a date
-                                is_date = False
-                                # Check if it's too long for Excel's precision
-                                if _count_significant_digits(value) > EXCEL_MAX_PRECISION_DIGITS:
-                                    has_long_number = True
-                                    is_numeric = False
-                            except ValueError:
-                                # Not numeric, check if it's a date
-                                is_numeric = False
-                                is_date_value, date_fmt = _is_date_like(value, detected_date_format)
-                                if not is_date_value:
-                                    is_date = False
-                                else:
-                                    # Cache the format for subsequent rows
-                                    if date_fmt:
-                                        detected_date_format = date_fmt
-                                    # Check if it has time component (datetime vs date)
-                                    if ' ' in value or 'T' in value:
-                                        is_datetime = True
-                        else:
-                            # Check if date object
-                            if isinstance(value, datetime):
-                                is_numeric = False
-                                is_datetime = True
-                            elif isinstance(value, date):
-                                is_numeric = False
-                            else:
-                                is_numeric = False
-                                is_date = False
-                        
-                        # Early exit if both checks failed
-                        if not is_numeric and not is_date:
-                            break
-                
-                # Apply formats based on detection and track results
-                col_letter = get_column_letter(col)
-                if has_data:
-                    # Log if column has long numbers that are kept as text
-                    if has_long_number:
-                        logger.info(
-                            f"Column {col_letter} contains numbers with >15 significant digits. "
-                            f"Keeping as text to prevent data loss (Excel's precision limit is 15 digits)."
-                        )
-                        auto_detection_results["long_number_columns"].append(col_letter)
-                    
-                    if auto_detect_numeric_columns and is_numeric and number_format:
-                        # Convert string numbers to actual numbers and apply format
-                        for row in range(start_row, end_row + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            if isinstance(cell.value, str) and cell.value.strip():
-                                try:
-                                    # Try integer first, then float
-                                    if '.' not in cell.value:
-                                        cell.value = int(cell.value)
-                                    else:
-                                        cell.value = float(cell.value)
-                                except ValueError:
-                                    pass  # Keep as string if conversion fails
-                            cell.number_format = number_format
-                        auto_detection_results["numeric_columns"].append(col_letter)
-                    
-                    if auto_detect_date_columns and is_date:
-                        # Determine appropriate date format
-                        if date_format:
-                            actual_date_format = date_format
-                        elif is_datetime:
-                            # Default datetime format
-                            actual_date_format = 'yyyy-mm-dd hh:mm:ss'
-                        else:
-                            # Default date-only format
-                            actual_date_format = 'yyyy-mm-dd'
-                        
-                        # Convert date strings to Excel date objects and apply format
-                        # Use cached format for performance
-                        column_date_format = detected_date_format
-                        for row in range(start_row, end_row + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            
-                            # Convert string dates to datetime objects
-                            if isinstance(cell.value, str) and cell.value.strip():
-                                parsed_date, fmt = _parse_date_string(cell.value, column_date_format)
-                                if parsed_date:
-                                    cell.value = parsed_date
-                                    # Cache format for next iteration
-                                    if fmt and not column_date_format:
-                                        column_date_format = fmt
-                            
-                            # Apply date format
-                            cell.number_format = actual_date_format
-                        
-                        # Track whether it's datetime or date
-                        if is_datetime:
-                            auto_detection_results["datetime_columns"].append(col_letter)
-                        else:
-                            auto_detection_results["date_columns"].append(col_letter)
-                    
-                    # Track text columns (columns that weren't detected as numeric or date)
-                    if not is_numeric and not is_date and not has_long_number:
-                        auto_detection_results["text_columns"].append(col_letter)
-        
-        # Apply column width settings
-        if column_width is not None:
-            # Apply absolute width to all columns in range
-            for col in range(start_col, end_col + 1):
-                col_letter = get_column_letter(col)
-                sheet.column_dimensions[col_letter].width = column_width
-        
-        if auto_column_width:
-            # Auto-adjust width based on content
-            # OPTIMIZATION: Only scan rows with actual data
-            # Reuse data range if already calculated, otherwise calculate it
-            if auto_detect_numeric_columns or auto_detect_date_columns:
-                # Already calculated above
-                scan_end_row = max_data_row
-            else:
-                # Calculate data range for width calculation only
-                scan_end_row, _ = get_actual_data_range(
-                    sheet, start_row, start_col, end_row, end_col, max_empty_rows=10
+            if not validate_cell_reference(spec['start_cell']):
+                raise ValidationError(
+                    f"Invalid start cell reference: {spec['start_cell']}"
                 )
-            
-            for col in range(start_col, end_col + 1):
-                max_length = 0
-                col_letter = get_column_letter(col)
-                
-                # ALWAYS check row 1 (header row) first, even if not in the formatting range
-                # This ensures column width accommodates the header
-                header_cell = sheet.cell(row=1, column=col)
-                if header_cell.value:
-                    header_str = str(header_cell.value)
-                    header_lines = header_str.split('\n')
-                    header_length = max(len(line) for line in header_lines)
-                    max_length = header_length
-                
-                # Then scan the data rows (only up to the last row with data)
-                for row in range(start_row, min(scan_end_row + 1, end_row + 1)):
-                    cell = sheet.cell(row=row, column=col)
-                    if cell.value:
-                        # Convert to string and handle multi-line content
-                        cell_str = str(cell.value)
-                        lines = cell_str.split('\n')
-                        # Get the longest line
-                        line_length = max(len(line) for line in lines)
-                        max_length = max(max_length, line_length)
-                
-                # Approximate width calculation (character width ~1.2)
-                # Add padding for better appearance
-                if max_length > 0:
-                    adjusted_width = (max_length * 1.2) + 2
-                    # Cap maximum width to 100 for readability
-                    adjusted_width = min(adjusted_width, 100)
-                    sheet.column_dimensions[col_letter].width = adjusted_width
-            
+            end_cell = spec.get('end_cell')
+            if end_cell and not validate_cell_reference(end_cell):
+                raise ValidationError(f"Invalid end cell reference: {end_cell}")
+
+        wb = get_or_create_workbook(filepath)
+        if sheet_name not in wb.sheetnames:
+            raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+        sheet = wb[sheet_name]
+        results = [_format_range_on_sheet(sheet, **spec) for spec in specs]
+        _evict_cached_workbook(filepath)
         wb.save(filepath)
-        
-        range_str = f"{start_cell}:{end_cell}" if end_cell else start_cell
-        result = {
-            "message": f"Applied formatting to range {range_str}",
-            "range": range_str
-        }
-        
-        # Add auto-detection results if any detection was performed
-        if auto_detect_numeric_columns or auto_detect_date_columns:
-            result["auto_detection"] = {
-                "numeric_columns": auto_detection_results["numeric_columns"],
-                "date_columns": auto_detection_results["date_columns"],
-                "datetime_columns": auto_detection_results["datetime_columns"],
-                "text_columns": auto_detection_results["text_columns"],
-                "long_number_columns": auto_detection_results["long_number_columns"]
-            }
-            
-            # Add summary message with column lists
-            summary_parts = []
-            if auto_detection_results["numeric_columns"]:
-                cols = ", ".join(auto_detection_results['numeric_columns'])
-                summary_parts.append(f"numeric: {cols}")
-            if auto_detection_results["date_columns"]:
-                cols = ", ".join(auto_detection_results['date_columns'])
-                summary_parts.append(f"date: {cols}")
-            if auto_detection_results["datetime_columns"]:
-                cols = ", ".join(auto_detection_results['datetime_columns'])
-                summary_parts.append(f"datetime: {cols}")
-            if auto_detection_results["long_number_columns"]:
-                cols = ", ".join(auto_detection_results['long_number_columns'])
-                summary_parts.append(f"long number (kept as text): {cols}")
-            if auto_detection_results["text_columns"]:
-                cols = ", ".join(auto_detection_results['text_columns'])
-                summary_parts.append(f"text: {cols}")
-            
-            if summary_parts:
-                result["auto_detection"]["summary"] = f"Detected columns - {'; '.join(summary_parts)}"
-        
-        return result
-        
+        return results
+
     except (ValidationError, FormattingError) as e:
         logger.error(str(e))
         raise
     except Exception as e:
         logger.error(f"Failed to apply formatting: {e}")
         raise FormattingError(str(e))
+
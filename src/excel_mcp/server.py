@@ -237,6 +237,35 @@ def format_range(
         logger.error(f"Error formatting range: {e}")
         raise
 
+@mcp.tool(
+    annotations=ToolAnnotations(
+        title="Format Ranges",
+        destructiveHint=True,
+    ),
+)
+def format_ranges(
+    filepath: str,
+    sheet_name: str,
+    specs: List[Dict[str, Any]],
+) -> str:
+    """Apply formatting to multiple ranges with one workbook load/save.
+
+    Each spec is a dict of format_range parameters without filepath and
+    sheet_name, e.g. {"start_cell": "A1", "end_cell": "C1", "bold": true}.
+    Much faster than repeated format_range calls on large files.
+    """
+    try:
+        full_path = get_excel_path(filepath)
+        from excel_mcp.formatting import format_ranges as format_ranges_func
+
+        results = format_ranges_func(full_path, sheet_name, specs)
+        return f"Formatted {len(results)} range(s) successfully"
+    except (ValidationError, FormattingError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error formatting ranges: {e}")
+        raise
+
 @mcp.tool(
     annotations=ToolAnnotations(
         title="Read Data from Excel",
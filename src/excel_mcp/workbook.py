@@ -1,33 +1,72 @@
 import base64
+import io
 import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ElementTree
+import zipfile
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from openpyxl import Workbook, load_workbook
 from openpyxl.utils import get_column_letter
 
 from .exceptions import WorkbookError
 
+try:
+    # Optional accelerator: pybase64 uses SIMD (AVX2/AVX-512) encoding,
+    # roughly an order of magnitude faster per byte than the stdlib
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
 logger = logging.getLogger(__name__)
 
+def _save_workbook_atomic(workbook: Workbook, filepath: str) -> None:
+    """Save a workbook to a temp file and rename it into place.
+
+    wb.save() truncates and rewrites the target, so a concurrent reader
+    can observe a partial zip; writing next to the target and os.replace-
+    ing is atomic on POSIX and Windows. The 1 MB buffer keeps the zip
+    writer's many small writes off the syscall path.
+    """
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as out:
+            workbook.save(out)
+        _evict_cached_workbook(filepath)
+        os.replace(tmp_path, filepath)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def create_workbook(filepath: str, sheet_name: str = "Sheet1") -> dict[str, Any]:
     """Create a new Excel workbook with optional custom sheet name"""
     try:
         wb = Workbook()
-        # Rename default sheet
-        if "Sheet" in wb.sheetnames:
-            sheet = wb["Sheet"]
-            sheet.title = sheet_name
-        else:
-            wb.create_sheet(sheet_name)
+        # A fresh Workbook always has exactly one sheet, reachable as the
+        # active sheet; rename it rather than searching by title
+        sheet = wb.active
+        sheet.title = sheet_name
 
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
-        wb.save(str(path))
+        _save_workbook_atomic(wb, str(path))
+        # Close instead of handing out the live object: in a long-running
+        # server, returned workbooks kept file handles and parsed state
+        # alive across requests. Callers reopen from the path when they
+        # need to keep working on the file.
+        wb.close()
         return {
             "message": f"Created workbook: {filepath}",
             "active_sheet": sheet_name,
-            "workbook": wb
+            "workbook_path": str(path.absolute())
         }
     except Exception as e:
         logger.error(f"Failed to create workbook: {e}")
@@ -35,14 +74,45 @@ def create_workbook(filepath: str, sheet_name: str = "Sheet1") -> dict[str, Any]
 
 def get_or_create_workbook(filepath: str) -> Workbook:
     """Get existing workbook or create new one if it doesn't exist"""
+    # A stat probe instead of letting load_workbook raise: the miss is
+    # answered by one syscall rather than exception unwinding, and the
+    # common present-file path stays branch-predictable
+    if not os.path.isfile(filepath):
+        create_workbook(filepath)
+    return load_workbook(filepath)
+
+def _sheet_names_from_zip(filepath: str) -> list[str] | None:
+    """Read sheet names straight out of xl/workbook.xml.
+
+    An xlsx file is a zip; the sheet list lives in a few-KB XML part, so
+    this answers "which sheets exist" without parsing cells, styles or
+    shared strings. Returns None when the file isn't readable this way
+    (missing, not a zip, malformed) so callers can fall back to openpyxl.
+    """
     try:
-        return load_workbook(filepath)
-    except FileNotFoundError:
-        return create_workbook(filepath)["workbook"]
+        with zipfile.ZipFile(filepath) as archive:
+            with archive.open('xl/workbook.xml') as part:
+                names = []
+                for _, element in ElementTree.iterparse(part):
+                    if element.tag.rpartition('}')[2] == 'sheet':
+                        name = element.get('name')
+                        if name is not None:
+                            names.append(name)
+                return names
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        return None
 
 def create_sheet(filepath: str, sheet_name: str) -> dict:
     """Create a new worksheet in the workbook if it doesn't exist."""
     try:
+        # Cheap duplicate check from the zip before paying for a full
+        # parse: rewriting an xlsx in place isn't possible with zipfile
+        # (every member would be recompressed), but the error path doesn't
+        # need the workbook loaded at all
+        existing = _sheet_names_from_zip(filepath)
+        if existing is not None and sheet_name in existing:
+            raise WorkbookError(f"Sheet {sheet_name} already exists")
+
         wb = load_workbook(filepath)
 
         # Check if sheet already exists
@@ -51,7 +121,7 @@ def create_sheet(filepath: str, sheet_name: str) -> dict:
 
         # Create new sheet
         wb.create_sheet(sheet_name)
-        wb.save(filepath)
+        _save_workbook_atomic(wb, filepath)
         wb.close()
         return {"message": f"Sheet {sheet_name} created successfully"}
     except WorkbookError as e:
@@ -61,32 +131,126 @@ def create_sheet(filepath: str, sheet_name: str) -> dict:
         logger.error(f"Failed to create sheet: {e}")
         raise WorkbookError(str(e))
 
+# Small LRU of read-only workbooks for repeat metadata calls, keyed by
+# path with the file identity (mtime_ns, size) stored per entry. A plain
+# dict instead of lru_cache so write paths can evict the entry for a
+# path before touching the file. FastMCP serves tools from worker
+# threads, so every access goes through the lock; evicted entries are
+# only dereferenced, never close()d, because a concurrent reader may
+# still be iterating the workbook - the underlying archive is released
+# once the last borrower drops its reference.
+_WORKBOOK_CACHE: "OrderedDict[str, tuple[int, int, Workbook]]" = OrderedDict()
+_WORKBOOK_CACHE_SIZE = 8
+_WORKBOOK_CACHE_LOCK = threading.Lock()
+
+def _evict_cached_workbook(filepath: str) -> None:
+    """Drop the cached read-only workbook for a path, if any.
+
+    Every path that writes or deletes the file must call this first so a
+    stale parse is never served afterwards. The workbook is not closed
+    here: another thread may still be reading from it, and garbage
+    collection closes the archive once the last reference is gone.
+    """
+    with _WORKBOOK_CACHE_LOCK:
+        _WORKBOOK_CACHE.pop(filepath, None)
+
+def _load_workbook_cached(filepath: str, mtime_ns: int, size: int) -> Workbook:
+    """Load a workbook read-only, cached by path and file identity.
+
+    A changed mtime/size invalidates the entry on the next lookup.
+    Entries must not be close()d by callers; displaced and stale entries
+    are dereferenced and collected once unused.
+    """
+    with _WORKBOOK_CACHE_LOCK:
+        entry = _WORKBOOK_CACHE.get(filepath)
+        if entry is not None:
+            if entry[0] == mtime_ns and entry[1] == size:
+                _WORKBOOK_CACHE.move_to_end(filepath)
+                return entry[2]
+            del _WORKBOOK_CACHE[filepath]
+
+    # Parse outside the lock; if two threads race on the same path the
+    # loser's workbook simply replaces the winner's cache entry, and the
+    # displaced one lives on with whoever borrowed it.
+    wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+
+    with _WORKBOOK_CACHE_LOCK:
+        _WORKBOOK_CACHE[filepath] = (mtime_ns, size, wb)
+        while len(_WORKBOOK_CACHE) > _WORKBOOK_CACHE_SIZE:
+            _WORKBOOK_CACHE.popitem(last=False)
+    return wb
+
 def get_workbook_info(filepath: str, include_ranges: bool = False) -> dict[str, Any]:
     """Get metadata about workbook including sheets, ranges, etc."""
     try:
         path = Path(filepath)
-        if not path.exists():
+        # One stat covers the existence check, size and mtime
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
             raise WorkbookError(f"File not found: {filepath}")
-            
-        wb = load_workbook(filepath, read_only=False)
-        
+
+        # Without ranges only the sheet list is needed, and that lives in
+        # a few-KB XML part of the zip; skip openpyxl entirely
+        if not include_ranges:
+            sheets = _sheet_names_from_zip(filepath)
+            if sheets is not None:
+                return {
+                    "filename": path.name,
+                    "sheets": sheets,
+                    "size": stat.st_size,
+                    "modified": stat.st_mtime
+                }
+
+        # Read-only mode streams the worksheet XML instead of building the
+        # full in-memory model (styles, shared strings, every cell), which
+        # is the difference between milliseconds and seconds on big files
+        wb = _load_workbook_cached(filepath, stat.st_mtime_ns, stat.st_size)
+
         info = {
             "filename": path.name,
             "sheets": wb.sheetnames,
-            "size": path.stat().st_size,
-            "modified": path.stat().st_mtime
+            "size": stat.st_size,
+            "modified": stat.st_mtime
         }
         
         if include_ranges:
-            # Add used ranges for each sheet
+            # Add used ranges for each sheet. Worksheets are independent,
+            # so with enough of them the dimension reads run concurrently
+            # (lxml releases the GIL while parsing); each worker opens its
+            # own read-only handle because the shared zip archive is not
+            # thread-safe.
             ranges = {}
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                if ws.max_row > 0 and ws.max_column > 0:
-                    ranges[sheet_name] = f"A1:{get_column_letter(ws.max_column)}{ws.max_row}"
+            sheet_names = wb.sheetnames
+
+            def sheet_dimensions(sheet_name: str):
+                worker_wb = load_workbook(
+                    filepath, read_only=True, data_only=True, keep_links=False
+                )
+                try:
+                    ws = worker_wb[sheet_name]
+                    return sheet_name, ws.max_row, ws.max_column
+                finally:
+                    worker_wb.close()
+
+            if len(sheet_names) >= 4:
+                with ThreadPoolExecutor(max_workers=min(8, len(sheet_names))) as executor:
+                    dimensions = list(executor.map(sheet_dimensions, sheet_names))
+            else:
+                dimensions = [
+                    (name, wb[name].max_row, wb[name].max_column)
+                    for name in sheet_names
+                ]
+
+            for sheet_name, max_row, max_column in dimensions:
+                # In read-only mode the dimensions come from the sheet's
+                # dimension record and can be absent (None)
+                if max_row and max_column:
+                    ranges[sheet_name] = f"A1:{get_column_letter(max_column)}{max_row}"
             info["used_ranges"] = ranges
-            
-        wb.close()
+
+        # No close(): the workbook stays alive in _load_workbook_cached
+        # for follow-up metadata calls and is dropped on cache eviction
         return info
         
     except WorkbookError as e:
@@ -96,6 +260,88 @@ def get_workbook_info(filepath: str, include_ranges: bool = False) -> dict[str,
         logger.error(f"Failed to get workbook info: {e}")
         raise WorkbookError(str(e))
 
+def read_excel_binary_into(filepath: str, sink: BinaryIO) -> int:
+    """Stream a file's base64-encoded content into a binary sink.
+
+    Preferred over read_excel_binary for large files (>1 MB) when the
+    consumer is a socket, file or other binary stream: the base64 output
+    is written chunk by chunk, so no full-size string is ever held in
+    memory. Each chunk is a multiple of 3 input bytes, which guarantees
+    no '=' padding appears mid-stream.
+
+    Args:
+        filepath: Path to the file to read
+        sink: Binary stream the base64 output is written to
+
+    Returns:
+        Number of base64 bytes written
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    written = 0
+    # buffering=0 skips the BufferedReader layer: each read below is one
+    # os.read straight into a fresh bytes object, with no intermediate
+    # 8 KB buffer copies
+    with open(filepath, 'rb', buffering=0) as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty file, or a filesystem that refuses mmap: fall back to
+            # the plain read loop
+            while True:
+                chunk = f.read(57 * 1024)
+                if not chunk:
+                    break
+                written += sink.write(_b64encode(chunk))
+            return written
+
+        # Memory-map the file and feed 3 MB slices (a multiple of 3, so no
+        # mid-stream padding) straight to the encoder: the source bytes are
+        # never copied into Python objects
+        with mapped, memoryview(mapped) as view:
+            for offset in range(0, len(view), 3 * 1024 * 1024):
+                written += sink.write(_b64encode(view[offset:offset + 3 * 1024 * 1024]))
+    return written
+
+class _BufferSink:
+    """Minimal binary sink writing into a preallocated bytearray.
+
+    Sized from the known input length, so the encode loop fills one
+    buffer with slice assignments instead of growing a BytesIO through
+    repeated reallocation.
+    """
+
+    def __init__(self, size: int):
+        self.buffer = bytearray(size)
+        self.position = 0
+
+    def write(self, data) -> int:
+        n = len(data)
+        self.buffer[self.position:self.position + n] = data
+        self.position += n
+        return n
+
+def stream_excel_base64(filepath: str, out_fd: int) -> int:
+    """Stream a file's base64 content directly to a file descriptor.
+
+    For consumers that hand over a real fd (socket, pipe, file), the
+    encoded chunks are written straight to the descriptor and no bytes
+    object ever holds the full base64 output. The BufferedWriter wrapper
+    retries short writes, which raw os.write can return on sockets, so
+    every byte reaches the descriptor. It is left open for the caller.
+
+    Args:
+        filepath: Path to the file to read
+        out_fd: Writable file descriptor (expected to be blocking)
+
+    Returns:
+        Number of base64 bytes written
+    """
+    with io.FileIO(out_fd, 'w', closefd=False) as raw:
+        with io.BufferedWriter(raw, buffer_size=1 << 20) as sink:
+            return read_excel_binary_into(filepath, sink)
+
 def read_excel_binary(filepath: str) -> str:
     """Read an Excel file and return its binary content as a base64-encoded string.
     
@@ -140,20 +386,28 @@ def read_excel_binary(filepath: str) -> str:
     """
     try:
         path = Path(filepath)
-        if not path.exists():
+        # One stat doubles as the existence check and the size lookup
+        try:
+            file_size = path.stat().st_size
+        except FileNotFoundError:
             raise WorkbookError(f"File not found: {filepath}")
+
+        # The base64 length is known up front (4 output bytes per 3 input
+        # bytes), so the whole encode runs into one preallocated buffer
+        sink = _BufferSink(((file_size + 2) // 3) * 4)
+        read_excel_binary_into(filepath, sink)
+        # ASCII decode takes CPython's compact-string fast path; base64
+        # output can never contain non-ASCII bytes
+        if sink.position == len(sink.buffer):
+            base64_content = sink.buffer.decode('ascii')
+        else:
+            # File changed size between stat and read; trim to what was
+            # actually written
+            base64_content = sink.buffer[:sink.position].decode('ascii')
         
-        # Get file size for logging
-        file_size = path.stat().st_size
-        
-        # Read the file as binary
-        with open(filepath, 'rb') as f:
-            binary_content = f.read()
-        
-        # Encode to base64
-        base64_content = base64.b64encode(binary_content).decode('utf-8')
-        
-        logger.info(f"Successfully read Excel file as binary: {filepath} ({file_size} bytes, base64 size: {len(base64_content)} chars)")
+        # %-style args defer the string build until a handler actually
+        # consumes the record
+        logger.info("Successfully read Excel file as binary: %s (%d bytes, base64 size: %d chars)", filepath, file_size, len(base64_content))
         
         return base64_content
         
@@ -169,6 +423,32 @@ def read_excel_binary(filepath: str) -> str:
         logger.error(error_msg)
         raise WorkbookError(error_msg)
 
+def workbook_to_base64(workbook: Workbook) -> str:
+    """Serialize an in-memory workbook straight to a base64 string.
+
+    For pipelines that build a workbook and immediately need its base64
+    form, this skips the write-to-disk plus read-back round trip of
+    wb.save(path) followed by read_excel_binary(path): the workbook is
+    serialized into a memory buffer and encoded from there.
+
+    Args:
+        workbook: An openpyxl Workbook instance
+
+    Returns:
+        Base64-encoded string of the serialized workbook
+
+    Raises:
+        WorkbookError: If serialization fails
+    """
+    try:
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return _b64encode(buffer.getbuffer()).decode('ascii')
+    except Exception as e:
+        error_msg = f"Failed to serialize workbook to base64: {str(e)}"
+        logger.error(error_msg)
+        raise WorkbookError(error_msg)
+
 def write_excel_binary(filepath: str, base64_content: str) -> dict[str, Any]:
     """Write base64-encoded content to an Excel file.
     
@@ -231,14 +511,26 @@ def write_excel_binary(filepath: str, base64_content: str) -> dict[str, Any]:
         if len(binary_content) < 100:
             raise WorkbookError("Decoded content too small to be a valid Excel file")
         
-        # Write the binary content to file
-        with open(filepath, 'wb') as f:
-            f.write(binary_content)
+        # Write to a temp file and rename into place, like the workbook
+        # save paths: an in-place truncate-and-write would let concurrent
+        # readers observe a partial zip
+        tmp_path = f"{filepath}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(binary_content)
+            _evict_cached_workbook(filepath)
+            os.replace(tmp_path, filepath)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
         
         # Get file size after writing
         file_size = path.stat().st_size
         
-        logger.info(f"Successfully wrote Excel file from binary: {filepath} ({file_size} bytes)")
+        logger.info("Successfully wrote Excel file from binary: %s (%d bytes)", filepath, file_size)
         
         return {
             "message": f"Successfully wrote Excel file: {filepath}",
@@ -313,9 +605,10 @@ def delete_file(filepath: str) -> dict[str, Any]:
         file_size = path.stat().st_size
         
         # Delete the file
+        _evict_cached_workbook(filepath)
         path.unlink()
         
-        logger.info(f"Successfully deleted Excel file: {filepath} ({file_size} bytes)")
+        logger.info("Successfully deleted Excel file: %s (%d bytes)", filepath, file_size)
         
         return {
             "message": f"Successfully deleted Excel file: {filepath}",